@@ -8,15 +8,35 @@ with options for in-place editing or custom output naming.
 """
 
 import argparse
-import re
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from rules import CONVERSION_RULES
+from rules import CONVERSION_RULES, FAST_RULES
 
+# Version of the conversion logic outside the rule list. Bump it whenever a
+# change to transform() or process_file() alters the output for the same
+# input and rules, so that stale cache entries are not reused
+OUTPUT_VERSION = 1
 
-def transform(text: str, verbose: bool = True) -> str:
+# Fingerprint of the rule set and OUTPUT_VERSION, mixed into cache keys so
+# that output cached by an older version of the converter is never reused
+RULES_DIGEST = hashlib.blake2b(
+    repr(
+        [OUTPUT_VERSION]
+        + [(r.pattern, r.replacement) for r in CONVERSION_RULES]
+    ).encode()
+).digest()
+
+
+def transform(text: bytes, verbose: bool = True) -> bytes:
     """
     Apply all conversion rules to transform LaTeX text to Typst markup.
 
+    The text is processed as raw bytes. All rules are pure ASCII, so this
+    works for UTF-8 and any other ASCII-compatible encoding without decoding.
+
     Args:
         text: The input LaTeX text
         verbose: Whether to print replacement statistics
@@ -24,11 +44,34 @@ def transform(text: str, verbose: bool = True) -> str:
     Returns:
         The transformed text in Typst format
     """
-    for rule in CONVERSION_RULES:
-        new_text, n = re.subn(rule.pattern, rule.replacement, text)
-        if n and verbose:
-            print(f"[{rule.name}] {n} replacements")
+    # Rules run as separate passes on purpose: each one sees the output of the
+    # previous ones, which is what converts nested commands such as
+    # \footnote{see \cite{key}}. A single fused pass would leave the outer
+    # command untouched once the inner one has been rewritten. For the same
+    # reason the order of the rules is part of the conversion.
+    stats = []
+    # Once no backslash is left, rules triggered by a command can be skipped
+    # without searching the text for their literal
+    has_backslash = b"\\" in text
+    for literal, compiled, replacement, name in FAST_RULES:
+        if not has_backslash and literal.startswith(b"\\"):
+            continue
+        if literal not in text:
+            continue
+        # Replacements are only counted when statistics are printed
+        n = 0
+        if verbose:
+            new_text, n = compiled.subn(replacement, text)
+        else:
+            new_text = compiled.sub(replacement, text)
+        if n:
+            stats.append(f"[{name}] {n} replacements")
+        if has_backslash and new_text is not text:
+            has_backslash = b"\\" in new_text
         text = new_text
+    # Emit all statistics in one write instead of one per rule
+    if stats:
+        print("\n".join(stats))
     return text
 
 
@@ -40,6 +83,51 @@ def print_rules():
         print(f"{rule.name}: {rule.description}")
 
 
+def cached_transform(
+    data: bytes, cache_dir: Path, verbose: bool = True
+) -> tuple[bytes, bool]:
+    """
+    Transform text, reusing earlier output for identical input.
+
+    Results are stored in cache_dir under a hash of the input and the rule
+    set, so unchanged files skip all rule passes on repeated runs. The cache
+    is best-effort: if it cannot be read or written, the text is converted
+    as usual.
+
+    Args:
+        data: The input LaTeX text
+        cache_dir: Directory holding cached output
+        verbose: Whether to print replacement statistics
+
+    Returns:
+        The transformed text in Typst format, and whether it came from the
+        cache
+    """
+    key = hashlib.blake2b(RULES_DIGEST, digest_size=16)
+    key.update(data)
+    cache_path = cache_dir / f"{key.hexdigest()}.typ"
+    try:
+        return cache_path.read_bytes(), True
+    except OSError:
+        pass
+
+    transformed = transform(data, verbose=verbose)
+    # Write under a unique name first so parallel workers never see a
+    # partially written entry
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(transformed)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: could not write cache entry {cache_path}: {e}")
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+    return transformed, False
+
+
 def process_file(file_path: Path, args) -> None:
     """
     Process a single file with the given arguments.
@@ -50,20 +138,38 @@ def process_file(file_path: Path, args) -> None:
     """
     print(f"Processing: {file_path}")
     try:
-        data = file_path.read_text(encoding="utf-8")
-        transformed = transform(data, verbose=not args.quiet)
+        data = file_path.read_bytes()
+        # UTF-16 and binary files contain NUL bytes and would be corrupted
+        # byte-wise; NUL is rare enough in LaTeX source to skip such files
+        if b"\x00" in data:
+            print(
+                f"Warning: {file_path} contains NUL bytes (UTF-16 or binary?), "
+                "skipping"
+            )
+            return
+        if args.cache_dir:
+            transformed, cached = cached_transform(
+                data, Path(args.cache_dir).expanduser(), verbose=not args.quiet
+            )
+            # No rules ran, so say why there are no replacement statistics
+            if cached:
+                print(f"Cached: {file_path}")
+        else:
+            transformed = transform(data, verbose=not args.quiet)
 
         if args.inplace and not args.prefix and not args.suffix:
-            file_path.write_text(transformed, encoding="utf-8")
+            # Nothing to convert, so leave the file (and its mtime) alone
+            if transformed == data:
+                print(f"Unchanged: {file_path}")
+                return
+            file_path.write_bytes(transformed)
             print(f"Updated in-place: {file_path}")
         else:
             output_name = f"{args.prefix}{file_path.stem}{args.suffix}{args.ext}"
             output_path = file_path.parent / output_name
-            output_path.write_text(transformed, encoding="utf-8")
+            output_path.write_bytes(transformed)
             print(f"Created: {output_path}")
 
-    except UnicodeDecodeError:
-        print(f"Warning: Could not decode {file_path} as UTF-8, skipping")
     except Exception as e:
         print(f"Error processing {file_path}: {e}")
 
@@ -78,7 +184,12 @@ Examples:
   %(prog)s document.tex                    # Convert single file in-place
   %(prog)s --prefix converted_ doc.tex     # Create converted_doc.typ
   %(prog)s --recursive --suffix _typst .  # Convert all .tex files in current dir
+  %(prog)s --jobs 4 --suffix _typst .     # Convert with 4 worker processes
+  %(prog)s --cache-dir ~/.cache/latex-to-typst .  # Reuse output for unchanged files
   %(prog)s --list-rules                   # Show all conversion rules
+
+Directories are converted in parallel by default, so the order of per-file
+output varies between runs unless --jobs 1 is given.
         """,
     )
 
@@ -108,6 +219,20 @@ Examples:
         action="store_true",
         help="Process all .tex files under given directory recursively",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of files to process in parallel (default: number of CPUs; "
+        "per-file output order is only deterministic with --jobs 1)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Reuse output for unchanged files from this directory "
+        "(e.g. ~/.cache/latex-to-typst)",
+    )
     parser.add_argument(
         "--quiet", action="store_true", help="Suppress replacement statistics output"
     )
@@ -126,6 +251,9 @@ Examples:
     if not args.path:
         parser.error("Path argument is required unless using --list-rules")
 
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
     path = Path(args.path)
 
     if not path.exists():
@@ -147,9 +275,14 @@ Examples:
             )
             return 1
 
-        print(f"Found {len(tex_files)} .tex file(s) to process")
-        for tex_file in tex_files:
-            process_file(tex_file, args)
+        print(f"Found {len(tex_files)} .tex file(s) to process", flush=True)
+        if args.jobs == 1 or len(tex_files) == 1:
+            for tex_file in tex_files:
+                process_file(tex_file, args)
+        else:
+            # Files are independent, so spread them over worker processes
+            with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+                list(executor.map(partial(process_file, args=args), tex_files))
     else:
         print(f"Error: '{args.path}' is neither a file nor a directory.")
         return 1